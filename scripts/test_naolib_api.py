@@ -7,20 +7,152 @@ Useful for initial exploration and verification before starting the full pipelin
 """
 
 import argparse
+import atexit
 import json
+import orjson
+import os
 import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from tabulate import tabulate
+from urllib3.util.retry import Retry
 
-def test_stop_data(stop_code, num_passages=5):
-    """Test retrieving data for a specific stop"""
-    url = f"https://open.tan.fr/ewp/tempsattentelieu.json/{stop_code}/{num_passages}"
+# (connect, read) timeouts in seconds
+TIMEOUT = (3.05, 10)
+
+# Retry transient server errors with exponential backoff
+RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504],
+              respect_retry_after_header=True)
+
+# Shared session: keeps the TLS connection to open.tan.fr alive between calls
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=RETRY))
+
+# Circuit breaker: after BREAKER_THRESHOLD consecutive failures, skip calls
+# for BREAKER_COOLDOWN seconds instead of waiting on a dead endpoint
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30
+_breaker = {'failures': 0, 'open_until': 0.0}
+_breaker_lock = threading.Lock()
+
+def record_result(success):
+    """Update the circuit breaker after a request"""
+    with _breaker_lock:
+        if success:
+            _breaker['failures'] = 0
+            return
+        _breaker['failures'] += 1
+        if _breaker['failures'] >= BREAKER_THRESHOLD:
+            _breaker['open_until'] = time.monotonic() + BREAKER_COOLDOWN
+
+# On-disk cache of slow-changing endpoints: url -> [etag, last_modified, body]
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.naolib_cache.json')
+
+def load_cache():
+    """Load the HTTP validator cache saved by a previous run"""
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache():
+    """Persist the HTTP validator cache for the next run, if it changed"""
+    if not _cache_dirty:
+        return
+    try:
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(_HTTP_CACHE, f)
+    except OSError:
+        pass  # e.g. read-only scripts/ directory: the cache is only an optimization
+
+_HTTP_CACHE = load_cache()
+_cache_dirty = False
+atexit.register(save_cache)
+
+def fetch(url, cache=False):
+    """Fetch a URL with the shared session and decode its JSON body
+    
+    With cache=True the request is revalidated with If-None-Match /
+    If-Modified-Since and the cached body is reused on HTTP 304.
+    While the circuit breaker is open, the cached body (if any) is returned
+    without contacting the API.
+    """
+    global _cache_dirty
+    headers = {}
+    cached = _HTTP_CACHE.get(url) if cache else None
+    if time.monotonic() < _breaker['open_until']:
+        if cached:
+            return orjson.loads(cached[2])
+        raise requests.exceptions.ConnectionError(f"API unavailable, skipping {url} for now")
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
     
+    try:
+        response = _SESSION.get(url, headers=headers, timeout=TIMEOUT)
+        if response.status_code >= 500:
+            response.raise_for_status()
+    except requests.exceptions.RequestException:
+        record_result(False)
+        raise
+    
+    if cached and response.status_code == 304:
+        record_result(True)
+        return orjson.loads(cached[2])
+    response.raise_for_status()  # Raise exception for 4XX/5XX responses
+    
+    try:
+        data = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Keep the requests exception hierarchy so callers' handlers still apply
+        record_result(False)
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON from {url}: {e}", response=response)
+    record_result(True)
+    
+    if cache:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            # Store the exact bytes the live path parses (the API serves UTF-8)
+            _HTTP_CACHE[url] = [etag, last_modified, response.content.decode('utf-8')]
+            _cache_dirty = True
+    return data
+
+def fetch_many(urls, max_workers=8):
+    """Fetch several URLs concurrently, returning (data, error) pairs in order"""
+    def fetch_safe(url):
+        try:
+            return fetch(url), None
+        except requests.exceptions.RequestException as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch_safe, urls))
+
+def show_stops(stop_codes, num_passages=5):
+    """Test retrieving data for several stops, fetched concurrently"""
+    urls = [f"https://open.tan.fr/ewp/tempsattentelieu.json/{code}/{num_passages}"
+            for code in stop_codes]
+    results = fetch_many(urls)
+    
+    success = True
+    for url, (data, error) in zip(urls, results):
+        success &= show_stop_data(url, data, error)
+    return success
+
+def show_stop_data(url, data, error=None):
+    """Display the arrivals returned by a stop endpoint"""
     print(f"Testing API endpoint: {url}")
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise exception for 4XX/5XX responses
+        if error is not None:
+            raise error
         
-        data = response.json()
         print("\n✅ Successfully retrieved data!")
         print(f"Number of arrivals: {len(data)}")
         
@@ -57,10 +189,7 @@ def list_nearby_stops(latitude, longitude):
     
     print(f"Finding stops near coordinates {latitude}, {longitude}")
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = fetch(url, cache=True)
         print(f"\n✅ Found {len(data)} stops nearby!")
         
         # Extract stop information
@@ -92,8 +221,8 @@ if __name__ == "__main__":
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
     # Stop data parser
-    stop_parser = subparsers.add_parser('stop', help='Get data for a specific stop')
-    stop_parser.add_argument('stop_code', help='Stop code (e.g., COMM, CRQU)')
+    stop_parser = subparsers.add_parser('stop', help='Get data for one or more stops')
+    stop_parser.add_argument('stop_codes', nargs='+', help='Stop codes (e.g., COMM CRQU)')
     stop_parser.add_argument('--passages', type=int, default=5,
                           help='Number of passages to retrieve (default: 5)')
     
@@ -105,7 +234,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     if args.command == 'stop':
-        test_stop_data(args.stop_code, args.passages)
+        show_stops(args.stop_codes, args.passages)
     elif args.command == 'nearby':
         list_nearby_stops(args.latitude, args.longitude)
     else: